@@ -3,36 +3,33 @@ Account Management API Routes - Handle CRUD operations for trading accounts
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from typing import List
 import logging
 
-from database.connection import SessionLocal
+from database.connection import get_db
 from database.models import Account
 from repositories.account_repo import (
-    create_account, get_account, get_accounts_by_user,
-    update_account, update_account_cash, deactivate_account,
-    get_or_create_default_account
+    create_account, get_account, get_account_for_session, get_account_rows_by_user,
+    update_account_cash,
+    update_account_owned, deactivate_account_owned,
+    ensure_default_account
 )
 from repositories.user_repo import verify_auth_session, get_user
 from schemas.account import (
     AccountCreate, AccountUpdate, AccountOut, AccountOverview
 )
+from services.account_cache import account_cache
+from services.session_cache import session_cache
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/accounts", tags=["accounts"])
+router = APIRouter(prefix="/api/accounts", tags=["accounts"], default_response_class=ORJSONResponse)
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-async def get_current_user_id(session_token: str, db: Session = Depends(get_db)) -> int:
+def get_current_user_id(session_token: str, db: Session = Depends(get_db)) -> int:
     """Get current user ID from session token"""
     user_id = verify_auth_session(db, session_token)
     if not user_id:
@@ -40,53 +37,48 @@ async def get_current_user_id(session_token: str, db: Session = Depends(get_db))
     return user_id
 
 
+def _account_not_owned_error(db: Session, account_id: int) -> HTTPException:
+    """Tell apart a missing account from someone else's, only after an owned lookup failed"""
+    if get_account(db, account_id):
+        return HTTPException(status_code=403, detail="Access denied")
+    return HTTPException(status_code=404, detail="Account not found")
+
+
 @router.get("/", response_model=List[AccountOut])
-async def list_user_accounts(session_token: str, db: Session = Depends(get_db)):
+def list_user_accounts(session_token: str, db: Session = Depends(get_db)):
     """Get all trading accounts for the current user"""
     try:
-        user_id = await get_current_user_id(session_token, db)
-        accounts = get_accounts_by_user(db, user_id, active_only=True)
-        
-        return [
-            AccountOut(
-                id=account.id,
-                user_id=account.user_id,
-                name=account.name,
-                model=account.model,
-                base_url=account.base_url,
-                api_key="****" + account.api_key[-4:] if account.api_key else "",  # Mask API key
-                initial_capital=float(account.initial_capital),
-                current_cash=float(account.current_cash),
-                frozen_cash=float(account.frozen_cash),
-                account_type=account.account_type,
-                is_active=account.is_active == "true"
-            )
-            for account in accounts
-        ]
+        user_id = get_current_user_id(session_token, db)
+        cached = account_cache.get(user_id)
+        if cached is not None:
+            return ORJSONResponse(cached)
+        
+        # Rows already hold the final AccountOut values (masked key, float balances,
+        # boolean flag), so return them directly instead of re-validating each one.
+        # response_model is kept for the OpenAPI schema.
+        rows = get_account_rows_by_user(db, user_id, active_only=True)
+        response = [row._asdict() for row in rows]
+        account_cache.set(user_id, response)
+        return ORJSONResponse(response)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get account list: {e}", exc_info=True)
+        logger.exception("Failed to get account list: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get account list: {str(e)}")
 
 
 @router.post("/", response_model=AccountOut)
-async def create_trading_account(
+def create_trading_account(
     session_token: str,
     account_data: AccountCreate,
     db: Session = Depends(get_db)
 ):
     """Create a new trading account"""
     try:
-        user_id = await get_current_user_id(session_token, db)
-        
-        # Check if account name exists for this user
-        existing_accounts = get_accounts_by_user(db, user_id, active_only=True)
-        for acc in existing_accounts:
-            if acc.name == account_data.name:
-                raise HTTPException(status_code=400, detail="Account name already exists")
+        user_id = get_current_user_id(session_token, db)
         
+        # Name uniqueness is enforced by the uq_acct_user_name index, see the IntegrityError handler
         account = create_account(
             db=db,
             user_id=user_id,
@@ -97,68 +89,55 @@ async def create_trading_account(
             base_url=account_data.base_url,
             api_key=account_data.api_key
         )
+        account_cache.invalidate_user(user_id)
         
-        return AccountOut(
-            id=account.id,
-            user_id=account.user_id,
-            name=account.name,
-            model=account.model,
-            base_url=account.base_url,
-            api_key="****" + account.api_key[-4:] if account.api_key else "",
-            initial_capital=float(account.initial_capital),
-            current_cash=float(account.current_cash),
-            frozen_cash=float(account.frozen_cash),
-            account_type=account.account_type,
-            is_active=account.is_active == "true"
-        )
+        return AccountOut.model_validate(account)
         
     except HTTPException:
         raise
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Account name already exists")
     except Exception as e:
-        logger.error(f"Failed to create account: {e}", exc_info=True)
+        logger.exception("Failed to create account: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to create account: {str(e)}")
 
 
 @router.get("/{account_id}", response_model=AccountOut)
-async def get_account_details(
+def get_account_details(
     account_id: int,
     session_token: str,
     db: Session = Depends(get_db)
 ):
     """Get account details"""
     try:
-        user_id = await get_current_user_id(session_token, db)
-        account = get_account(db, account_id)
-        
+        # A cached session and response need no query at all
+        user_id = session_cache.get(session_token)
+        if user_id is not None:
+            cached = account_cache.get(user_id, account_id)
+            if cached is not None:
+                return cached
+        
+        # Otherwise session validity and ownership are checked together by the JOIN,
+        # the only query for a valid request
+        account = get_account_for_session(db, session_token, account_id)
         if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
+            get_current_user_id(session_token, db)  # 401 for an invalid session
+            raise _account_not_owned_error(db, account_id)
         
-        if account.user_id != user_id:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        return AccountOut(
-            id=account.id,
-            user_id=account.user_id,
-            name=account.name,
-            model=account.model,
-            base_url=account.base_url,
-            api_key="****" + account.api_key[-4:] if account.api_key else "",
-            initial_capital=float(account.initial_capital),
-            current_cash=float(account.current_cash),
-            frozen_cash=float(account.frozen_cash),
-            account_type=account.account_type,
-            is_active=account.is_active == "true"
-        )
+        response = AccountOut.model_validate(account)
+        account_cache.set(account.user_id, response, account_id)
+        return response
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get account details: {e}", exc_info=True)
+        logger.exception("Failed to get account details: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get account details: {str(e)}")
 
 
 @router.put("/{account_id}", response_model=AccountOut)
-async def update_trading_account(
+def update_trading_account(
     account_id: int,
     session_token: str,
     account_data: AccountUpdate,
@@ -166,105 +145,72 @@ async def update_trading_account(
 ):
     """Update trading account"""
     try:
-        user_id = await get_current_user_id(session_token, db)
-        account = get_account(db, account_id)
+        user_id = get_current_user_id(session_token, db)
         
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
-        
-        if account.user_id != user_id:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        # Check if new name conflicts with existing accounts
-        if account_data.name:
-            existing_accounts = get_accounts_by_user(db, user_id, active_only=True)
-            for acc in existing_accounts:
-                if acc.name == account_data.name and acc.id != account_id:
-                    raise HTTPException(status_code=400, detail="Account name already exists")
-        
-        updated_account = update_account(
+        # Ownership is enforced by the UPDATE itself
+        updated_account = update_account_owned(
             db=db,
             account_id=account_id,
+            user_id=user_id,
             name=account_data.name,
             model=account_data.model,
             base_url=account_data.base_url,
             api_key=account_data.api_key
         )
+        if not updated_account:
+            raise _account_not_owned_error(db, account_id)
+        account_cache.invalidate_user(user_id)
         
-        return AccountOut(
-            id=updated_account.id,
-            user_id=updated_account.user_id,
-            name=updated_account.name,
-            model=updated_account.model,
-            base_url=updated_account.base_url,
-            api_key="****" + updated_account.api_key[-4:] if updated_account.api_key else "",
-            initial_capital=float(updated_account.initial_capital),
-            current_cash=float(updated_account.current_cash),
-            frozen_cash=float(updated_account.frozen_cash),
-            account_type=updated_account.account_type,
-            is_active=updated_account.is_active == "true"
-        )
+        return AccountOut.model_validate(updated_account)
         
     except HTTPException:
         raise
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Account name already exists")
     except Exception as e:
-        logger.error(f"Failed to update account: {e}", exc_info=True)
+        logger.exception("Failed to update account: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to update account: {str(e)}")
 
 
 @router.delete("/{account_id}")
-async def delete_trading_account(
+def delete_trading_account(
     account_id: int,
     session_token: str,
     db: Session = Depends(get_db)
 ):
     """Delete trading account (soft delete)"""
     try:
-        user_id = await get_current_user_id(session_token, db)
-        account = get_account(db, account_id)
-        
+        user_id = get_current_user_id(session_token, db)
+        account = deactivate_account_owned(db, account_id, user_id)
         if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
-        
-        if account.user_id != user_id:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        deactivate_account(db, account_id)
+            raise _account_not_owned_error(db, account_id)
+        account_cache.invalidate_user(user_id)
         return {"message": f"Account {account.name} deactivated successfully"}
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to delete account: {e}", exc_info=True)
+        logger.exception("Failed to delete account: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to delete account: {str(e)}")
 
 
 @router.get("/{account_id}/default")
-async def get_or_create_default(
+def get_or_create_default(
     session_token: str,
     db: Session = Depends(get_db)
 ):
     """Get or create default account (for backward compatibility)"""
     try:
-        user_id = await get_current_user_id(session_token, db)
-        account = get_or_create_default_account(db, user_id)
+        user_id = get_current_user_id(session_token, db)
+        account, created = ensure_default_account(db, user_id)
+        if created:
+            account_cache.invalidate_user(user_id)
         
-        return AccountOut(
-            id=account.id,
-            user_id=account.user_id,
-            name=account.name,
-            model=account.model,
-            base_url=account.base_url,
-            api_key="****" + account.api_key[-4:] if account.api_key else "",
-            initial_capital=float(account.initial_capital),
-            current_cash=float(account.current_cash),
-            frozen_cash=float(account.frozen_cash),
-            account_type=account.account_type,
-            is_active=account.is_active == "true"
-        )
+        return AccountOut.model_validate(account)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get default account: {e}", exc_info=True)
+        logger.exception("Failed to get default account: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get default account: {str(e)}")
\ No newline at end of file
@@ -3,14 +3,15 @@ Account and Asset Curve API Routes (Cleaned)
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy import func
 from typing import List
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 import logging
 
-from database.connection import SessionLocal
+from database.connection import get_db
 from database.models import Account, Position, Trade, CryptoPrice
 
 logger = logging.getLogger(__name__)
@@ -18,24 +19,21 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/account", tags=["account"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/list")
 async def list_all_accounts(db: Session = Depends(get_db)):
     """Get all active accounts (for paper trading demo)"""
     try:
-        from database.models import User
-        accounts = db.query(Account).filter(Account.is_active == "true").all()
+        # Load owners in the same query instead of one User lookup per account
+        accounts = (
+            db.query(Account)
+            .options(joinedload(Account.user))
+            .filter(Account.is_active.is_(True))
+            .all()
+        )
         
         result = []
         for account in accounts:
-            user = db.query(User).filter(User.id == account.user_id).first()
+            user = account.user
             result.append({
                 "id": account.id,
                 "user_id": account.user_id,
@@ -48,7 +46,7 @@ async def list_all_accounts(db: Session = Depends(get_db)):
                 "model": account.model,
                 "base_url": account.base_url,
                 "api_key": account.api_key,
-                "is_active": account.is_active == "true"
+                "is_active": account.is_active
             })
         
         return result
@@ -64,7 +62,7 @@ async def get_specific_account_overview(account_id: int, db: Session = Depends(g
         # Get the specific account
         account = db.query(Account).filter(
             Account.id == account_id,
-            Account.is_active == "true"
+            Account.is_active.is_(True)
         ).first()
         
         if not account:
@@ -111,7 +109,7 @@ async def get_account_overview(db: Session = Depends(get_db)):
     """Get overview for the default account (for paper trading demo)"""
     try:
         # Get the first active account (default account)
-        account = db.query(Account).filter(Account.is_active == "true").first()
+        account = db.query(Account).filter(Account.is_active.is_(True)).first()
         
         if not account:
             raise HTTPException(status_code=404, detail="No active account found")
@@ -184,7 +182,7 @@ async def create_new_account(payload: dict, db: Session = Depends(get_db)):
             initial_capital=float(payload.get("initial_capital", 10000.0)),
             current_cash=float(payload.get("initial_capital", 10000.0)),
             frozen_cash=0.0,
-            is_active="true"
+            is_active=True
         )
         
         db.add(new_account)
@@ -211,10 +209,13 @@ async def create_new_account(payload: dict, db: Session = Depends(get_db)):
             "model": new_account.model,
             "base_url": new_account.base_url,
             "api_key": new_account.api_key,
-            "is_active": new_account.is_active == "true"
+            "is_active": new_account.is_active
         }
     except HTTPException:
         raise
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Account name already exists")
     except Exception as e:
         logger.error(f"Failed to create account: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create account: {str(e)}")
@@ -228,7 +229,7 @@ async def update_account_settings(account_id: int, payload: dict, db: Session =
         
         account = db.query(Account).filter(
             Account.id == account_id,
-            Account.is_active == "true"
+            Account.is_active.is_(True)
         ).first()
         
         if not account:
@@ -281,10 +282,13 @@ async def update_account_settings(account_id: int, payload: dict, db: Session =
             "model": account.model,
             "base_url": account.base_url,
             "api_key": account.api_key,
-            "is_active": account.is_active == "true"
+            "is_active": account.is_active
         }
     except HTTPException:
         raise
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Account name already exists")
     except Exception as e:
         logger.error(f"Failed to update account: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to update account: {str(e)}")
@@ -315,7 +319,7 @@ async def get_asset_curve_by_timeframe(
         period = timeframe_map[timeframe]
         
         # Get all active accounts
-        accounts = db.query(Account).filter(Account.is_active == "true").all()
+        accounts = db.query(Account).filter(Account.is_active.is_(True)).all()
         if not accounts:
             return []
         
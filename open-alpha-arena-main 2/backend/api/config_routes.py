@@ -8,7 +8,7 @@ from pydantic import BaseModel
 from typing import Optional
 import logging
 
-from database.connection import SessionLocal
+from database.connection import get_db
 from database.models import SystemConfig
 
 logger = logging.getLogger(__name__)
@@ -16,14 +16,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/config", tags=["config"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 class ConfigUpdateRequest(BaseModel):
     key: str
     value: str
@@ -9,7 +9,7 @@ from typing import List, Optional
 from pydantic import BaseModel
 import logging
 
-from database.connection import SessionLocal
+from database.connection import get_db
 from database.models import User, Order, Account
 from schemas.order import OrderCreate, OrderOut
 from services.order_matching import create_order, check_and_execute_order, get_pending_orders, cancel_order, process_all_pending_orders
@@ -20,15 +20,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/orders", tags=["orders"])
 
 
-def get_db():
-    """Get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 class OrderCreateRequest(BaseModel):
     """Order creation request model"""
     user_id: int
@@ -106,7 +97,7 @@ async def create_new_order(request: OrderCreateRequest, db: Session = Depends(ge
         # Resolve trading account for the user (default user initialized in backend/main.py has at least one account)
         account = (
             db.query(Account)
-            .filter(Account.user_id == user.id, Account.is_active == "true")
+            .filter(Account.user_id == user.id, Account.is_active.is_(True))
             .first()
         )
         if not account:
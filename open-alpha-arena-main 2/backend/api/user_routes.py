@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 from typing import List
 import logging
 
-from database.connection import SessionLocal
+from database.connection import get_db
 from database.models import User
 from repositories.user_repo import (
     create_user, get_user, get_user_by_username, 
@@ -22,14 +22,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/users", tags=["users"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/register", response_model=UserOut)
 async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     try:
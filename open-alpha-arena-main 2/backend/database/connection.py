@@ -4,15 +4,29 @@ from sqlalchemy.orm import sessionmaker, declarative_base, scoped_session
 DATABASE_URL = "sqlite:///./data.db"
 
 engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=10,  # Connections kept open for request handlers and background services
+    max_overflow=20,  # Extra connections allowed under bursts before callers wait
+    pool_recycle=3600,
+    query_cache_size=1200,  # Compiled statement cache, sized above the default 500 for the ORM's many query shapes
 )
+# Thread-local sessions for background services, startup and websocket code. These keep
+# the default expire_on_commit=True: a job may commit many times in one session and must
+# see balances that other sessions changed in between
 SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+# Request sessions live for a single handler, so expire_on_commit=False keeps just-written
+# attributes usable without a reload SELECT
+RequestSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
 
 def get_db():
-    db = SessionLocal()
+    # A plain per-request session, not SessionLocal: FastAPI may enter this dependency
+    # and run a sync handler on different threadpool workers, so a thread-local
+    # session could be handed to two concurrent requests
+    db = RequestSessionLocal()
     try:
         yield db
     finally:
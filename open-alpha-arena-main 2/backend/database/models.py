@@ -1,11 +1,30 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, TIMESTAMP, ForeignKey, UniqueConstraint, Float, Date, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DECIMAL, TIMESTAMP, ForeignKey, UniqueConstraint, Index, Float, Date, DateTime
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.sql import func, case, literal
+from sqlalchemy.types import TypeDecorator
 import datetime
 
 from .connection import Base
 
 
+class Money(TypeDecorator):
+    """DECIMAL(18, 2) amount read back as a float rounded to 2 places
+
+    SQLite does not enforce the declared scale and returns whole amounts as int,
+    so the rounding the Decimal result processor used to do is kept here.
+    """
+    impl = DECIMAL
+    cache_ok = True
+
+    def __init__(self, precision: int = 18, scale: int = 2):
+        super().__init__(precision, scale, asdecimal=False)
+        self.scale = scale
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else round(float(value), self.scale)
+
+
 class User(Base):
     """
     User for authentication and account management
@@ -40,17 +59,17 @@ class Account(Base):
     # Account Identity
     name = Column(String(100), nullable=False)  # Display name (e.g., "GPT Trader", "Claude Analyst")
     account_type = Column(String(20), nullable=False, default="AI")  # "AI" or "MANUAL"
-    is_active = Column(String(10), nullable=False, default="true")
+    is_active = Column(Boolean, nullable=False, default=True)
     
     # AI Model Configuration (for AI accounts)
     model = Column(String(100), nullable=True, default="gpt-4")  # AI model name
     base_url = Column(String(500), nullable=True, default="https://api.openai.com/v1")  # API endpoint
     api_key = Column(String(500), nullable=True)  # API key for authentication
     
-    # Trading Account Balances (USD for CRYPTO market)
-    initial_capital = Column(DECIMAL(18, 2), nullable=False, default=10000.00)
-    current_cash = Column(DECIMAL(18, 2), nullable=False, default=10000.00)
-    frozen_cash = Column(DECIMAL(18, 2), nullable=False, default=0.00)
+    # Trading Account Balances (USD for CRYPTO market), read back as float since every consumer works in float
+    initial_capital = Column(Money(18, 2), nullable=False, default=10000.00)
+    current_cash = Column(Money(18, 2), nullable=False, default=10000.00)
+    frozen_cash = Column(Money(18, 2), nullable=False, default=0.00)
     
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     updated_at = Column(
@@ -62,6 +81,27 @@ class Account(Base):
     positions = relationship("Position", back_populates="account")
     orders = relationship("Order", back_populates="account")
 
+    @hybrid_property
+    def api_key_masked(self):
+        """API key reduced to "****" plus its last 4 characters, safe to return from the API"""
+        return "****" + self.api_key[-4:] if self.api_key else ""
+
+    @api_key_masked.expression
+    def api_key_masked(cls):
+        return case(
+            (func.coalesce(cls.api_key, "") != "", literal("****") + func.substr(cls.api_key, -4)),
+            else_="",
+        )
+
+    __table_args__ = (
+        Index('ix_acct_user_active', 'user_id', 'is_active'),
+        # Names are unique per user among active accounts; soft-deleted accounts keep their old names
+        Index(
+            'uq_acct_user_name', 'user_id', 'name', unique=True,
+            sqlite_where=is_active.is_(True), postgresql_where=is_active.is_(True),
+        ),
+    )
+
 
 class UserAuthSession(Base):
     __tablename__ = "user_auth_sessions"
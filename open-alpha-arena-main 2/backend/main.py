@@ -3,11 +3,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 import os
+import logging
 
 from database.connection import engine, Base, SessionLocal
 from database.models import TradingConfig, User, Account, SystemConfig
 from config.settings import DEFAULT_TRADING_CONFIGS
+
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Crypto Paper Trading API")
 
 # Health check endpoint
@@ -32,10 +37,34 @@ if os.path.exists(static_dir):
         app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
 
 
+def _migrate_account_is_active_to_boolean():
+    """Convert legacy accounts.is_active "true"/"false" strings into a real boolean column"""
+    with engine.begin() as conn:
+        columns = {row[1]: row[2] for row in conn.exec_driver_sql("PRAGMA table_info(accounts)")}
+        if columns.get("is_active", "BOOLEAN").upper() == "BOOLEAN":
+            return
+        # The old column keeps TEXT affinity (so 0 would read back as "0"), hence rebuild it
+        conn.exec_driver_sql("ALTER TABLE accounts RENAME COLUMN is_active TO is_active_legacy")
+        conn.exec_driver_sql("ALTER TABLE accounts ADD COLUMN is_active BOOLEAN NOT NULL DEFAULT 1")
+        conn.exec_driver_sql("UPDATE accounts SET is_active = (is_active_legacy = 'true')")
+        conn.exec_driver_sql("ALTER TABLE accounts DROP COLUMN is_active_legacy")
+
+
 @app.on_event("startup")
 def on_startup():
     # Create tables
     Base.metadata.create_all(bind=engine)
+    # ix_accounts_user_name_active was superseded by uq_acct_user_name. Drop it before the
+    # is_active migration, since SQLite cannot drop a column that an index still covers
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ix_accounts_user_name_active")
+    _migrate_account_is_active_to_boolean()
+    # create_all skips tables that already exist, so add any new account indexes explicitly
+    for index in Account.__table__.indexes:
+        try:
+            index.create(bind=engine, checkfirst=True)
+        except IntegrityError as e:
+            logger.warning("Could not create index %s, existing rows violate it: %s", index.name, e)
     # Seed trading configs if empty
     db: Session = SessionLocal()
     try:
@@ -104,7 +133,7 @@ def on_startup():
                 initial_capital=10000.0,  # $10,000 starting capital for crypto trading
                 current_cash=10000.0,
                 frozen_cash=0.0,
-                is_active="true"
+                is_active=True
             )
             db.add(default_account)
             db.commit()
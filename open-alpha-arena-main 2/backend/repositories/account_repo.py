@@ -1,7 +1,36 @@
 from sqlalchemy.orm import Session
-from typing import Optional, List
-from database.models import Account, User
+from sqlalchemy import Row, insert, update, select, lambda_stmt
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, List, Tuple
+from database.models import Account, User, UserAuthSession
+from services.session_cache import session_cache
 from decimal import Decimal
+import datetime
+
+
+# Columns needed to build an AccountOut; list queries skip the rest (version, timestamps)
+ACCOUNT_OUT_COLUMNS = (
+    Account.id,
+    Account.user_id,
+    Account.name,
+    Account.model,
+    Account.base_url,
+    Account.api_key,
+    Account.initial_capital,
+    Account.current_cash,
+    Account.frozen_cash,
+    Account.account_type,
+    Account.is_active,
+)
+
+# Same columns with api_key masked in SQL, so read-only listings never pull the
+# full secret into the application. Labelled "api_key", so with balances already
+# read back as rounded floats (see Money) each row carries the final AccountOut
+# values and can be serialized without going through Pydantic.
+ACCOUNT_OUT_MASKED_COLUMNS = tuple(
+    Account.api_key_masked.label("api_key") if column is Account.api_key else column
+    for column in ACCOUNT_OUT_COLUMNS
+)
 
 
 def create_account(
@@ -26,7 +55,7 @@ def create_account(
         initial_capital=initial_capital,
         current_cash=initial_capital,
         frozen_cash=0.0,
-        is_active="true"
+        is_active=True
     )
     db.add(account)
     db.commit()
@@ -34,20 +63,77 @@ def create_account(
     return account
 
 
+def bulk_create_accounts(db: Session, rows: List[dict]) -> List[int]:
+    """Create several trading accounts in one INSERT and return their IDs
+
+    Each row takes the same keys as create_account (user_id, name, account_type,
+    initial_capital, model, base_url, api_key).
+    """
+    if not rows:
+        return []
+
+    values = []
+    for row in rows:
+        account_type = row.get("account_type", "AI")
+        initial_capital = row.get("initial_capital", 10000.0)
+        is_ai = account_type == "AI"
+        values.append({
+            "user_id": row["user_id"],
+            "version": "v1",
+            "name": row["name"],
+            "account_type": account_type,
+            "model": row.get("model", "gpt-4-turbo") if is_ai else None,
+            "base_url": row.get("base_url", "https://api.openai.com/v1") if is_ai else None,
+            "api_key": row.get("api_key") if is_ai else None,
+            "initial_capital": initial_capital,
+            "current_cash": initial_capital,
+            "frozen_cash": 0.0,
+            "is_active": True,
+        })
+
+    account_ids = db.scalars(insert(Account).returning(Account.id, sort_by_parameter_order=True), values).all()
+    db.commit()
+    return list(account_ids)
+
+
 def get_account(db: Session, account_id: int) -> Optional[Account]:
     """Get account by ID"""
-    return db.query(Account).filter(Account.id == account_id).first()
+    # lambda_stmt caches the constructed statement, account_id is extracted as a bound parameter
+    stmt = lambda_stmt(lambda: select(Account).where(Account.id == account_id))
+    return db.execute(stmt).scalars().first()
+
+
+def get_account_for_session(db: Session, session_token: str, account_id: int) -> Optional[Account]:
+    """Get an account if it belongs to the owner of a valid session, auth and lookup in one query
+
+    A matching session is cached the way verify_auth_session would cache it.
+    """
+    row = db.execute(
+        select(Account, UserAuthSession.expires_at)
+        .join(UserAuthSession, UserAuthSession.user_id == Account.user_id)
+        .where(
+            UserAuthSession.session_token == session_token,
+            UserAuthSession.expires_at > datetime.datetime.utcnow(),
+            Account.id == account_id
+        )
+    ).first()
+    if not row:
+        return None
+    
+    account, session_expires_at = row
+    session_cache.set(session_token, account.user_id, session_expires_at)
+    return account
 
 
-def get_accounts_by_user(db: Session, user_id: int, active_only: bool = True) -> List[Account]:
-    """Get all accounts for a user"""
-    query = db.query(Account).filter(Account.user_id == user_id)
+def get_account_rows_by_user(db: Session, user_id: int, active_only: bool = True) -> List[Row]:
+    """Get AccountOut-shaped rows for a user, with api_key already masked"""
+    stmt = lambda_stmt(lambda: select(*ACCOUNT_OUT_MASKED_COLUMNS).where(Account.user_id == user_id))
     if active_only:
-        query = query.filter(Account.is_active == "true")
-    return query.all()
+        stmt += lambda s: s.where(Account.is_active.is_(True))
+    return db.execute(stmt).all()
 
 
-def get_or_create_default_account(
+def ensure_default_account(
     db: Session,
     user_id: int,
     account_name: str = "Default AI Trader",
@@ -55,24 +141,48 @@ def get_or_create_default_account(
     model: str = "gpt-4-turbo",
     base_url: str = "https://api.openai.com/v1",
     api_key: str = "default-key-please-update-in-settings"
-) -> Account:
-    """Get existing account or create default AI account for user"""
-    # Check if user has any accounts
-    existing_accounts = get_accounts_by_user(db, user_id, active_only=True)
-    if existing_accounts:
-        return existing_accounts[0]  # Return first active account
+) -> Tuple[Account, bool]:
+    """Get existing account or create default AI account for user, and whether it was created"""
+    # Return first active account, a single LIMIT 1 lookup on the hot path
+    account = db.execute(
+        select(Account).where(Account.user_id == user_id, Account.is_active.is_(True)).limit(1)
+    ).scalars().first()
+    if account:
+        return account, False
     
-    # Create default AI account
-    return create_account(
-        db=db,
-        user_id=user_id,
-        name=account_name,
-        account_type="AI",
-        initial_capital=initial_capital,
-        model=model,
-        base_url=base_url,
-        api_key=api_key
-    )
+    # Create default AI account. Concurrent first calls both land here; the partial
+    # uq_acct_user_name index rejects the loser's insert, which then reads the winner's row.
+    # A plain INSERT rather than ON CONFLICT, so this still works on a database where
+    # legacy duplicate names kept that index from being created at startup
+    try:
+        account = create_account(
+            db=db,
+            user_id=user_id,
+            name=account_name,
+            account_type="AI",
+            initial_capital=initial_capital,
+            model=model,
+            base_url=base_url,
+            api_key=api_key
+        )
+        return account, True
+    except IntegrityError:
+        db.rollback()
+    
+    account = db.execute(
+        select(Account).where(
+            Account.user_id == user_id,
+            Account.name == account_name,
+            Account.is_active.is_(True)
+        )
+    ).scalars().first()
+    return account, False
+
+
+def get_or_create_default_account(db: Session, user_id: int, **kwargs) -> Account:
+    """Get existing account or create default AI account for user"""
+    account, _ = ensure_default_account(db, user_id, **kwargs)
+    return account
 
 
 def update_account(
@@ -98,10 +208,34 @@ def update_account(
         account.api_key = api_key
     
     db.commit()
-    db.refresh(account)
     return account
 
 
+def update_account_owned(db: Session, account_id: int, user_id: int, **fields) -> Optional[Account]:
+    """Update an account only if it belongs to user_id, in one UPDATE ... RETURNING
+
+    Fields passed as None are left unchanged. Returns None when no account with
+    this ID is owned by the user.
+    """
+    values = {key: value for key, value in fields.items() if value is not None}
+    if not values:
+        return db.query(Account).filter(Account.id == account_id, Account.user_id == user_id).first()
+
+    account = db.execute(
+        update(Account)
+        .where(Account.id == account_id, Account.user_id == user_id)
+        .values(**values)
+        .returning(Account)
+    ).scalar_one_or_none()
+    db.commit()
+    return account
+
+
+def deactivate_account_owned(db: Session, account_id: int, user_id: int) -> Optional[Account]:
+    """Deactivate an account only if it belongs to user_id"""
+    return update_account_owned(db, account_id, user_id, is_active=False)
+
+
 def update_account_cash(
     db: Session,
     account_id: int,
@@ -118,7 +252,6 @@ def update_account_cash(
         account.frozen_cash = frozen_cash
     
     db.commit()
-    db.refresh(account)
     return account
 
 
@@ -128,9 +261,8 @@ def deactivate_account(db: Session, account_id: int) -> Optional[Account]:
     if not account:
         return None
     
-    account.is_active = "false"
+    account.is_active = False
     db.commit()
-    db.refresh(account)
     return account
 
 
@@ -140,7 +272,30 @@ def activate_account(db: Session, account_id: int) -> Optional[Account]:
     if not account:
         return None
     
-    account.is_active = "true"
+    account.is_active = True
     db.commit()
-    db.refresh(account)
-    return account
\ No newline at end of file
+    return account
+
+
+def _set_accounts_active(db: Session, account_ids: List[int], is_active: bool) -> int:
+    if not account_ids:
+        return 0
+
+    result = db.execute(
+        update(Account)
+        .where(Account.id.in_(account_ids))
+        .values(is_active=is_active)
+        .execution_options(synchronize_session="fetch")
+    )
+    db.commit()
+    return result.rowcount
+
+
+def bulk_deactivate(db: Session, account_ids: List[int]) -> int:
+    """Deactivate several accounts in one UPDATE, returns the number of rows changed"""
+    return _set_accounts_active(db, account_ids, False)
+
+
+def bulk_activate(db: Session, account_ids: List[int]) -> int:
+    """Activate several accounts in one UPDATE, returns the number of rows changed"""
+    return _set_accounts_active(db, account_ids, True)
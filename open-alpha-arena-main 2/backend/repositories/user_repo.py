@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from typing import Optional
 from database.models import User, UserAuthSession
+from services.session_cache import session_cache
 import hashlib
 import secrets
 import datetime
@@ -133,17 +134,26 @@ def create_auth_session(db: Session, user_id: int) -> Optional[UserAuthSession]:
     db.commit()
     db.refresh(session)
     
+    session_cache.set(session_token, user_id, expires_at)
     return session
 
 
 def verify_auth_session(db: Session, session_token: str) -> Optional[int]:
     """Verify session token and return user_id if valid"""
+    cached_user_id = session_cache.get(session_token)
+    if cached_user_id is not None:
+        return cached_user_id
+    
     session = db.query(UserAuthSession).filter(
         UserAuthSession.session_token == session_token,
         UserAuthSession.expires_at > datetime.datetime.utcnow()
     ).first()
     
-    return session.user_id if session else None
+    if not session:
+        return None
+    
+    session_cache.set(session_token, session.user_id, session.expires_at)
+    return session.user_id
 
 
 def cleanup_expired_sessions(db: Session, user_id: int = None) -> int:
@@ -164,6 +174,7 @@ def cleanup_expired_sessions(db: Session, user_id: int = None) -> int:
 
 def revoke_auth_session(db: Session, session_token: str) -> bool:
     """Revoke a specific session token"""
+    session_cache.delete(session_token)
     session = db.query(UserAuthSession).filter(
         UserAuthSession.session_token == session_token
     ).first()
@@ -178,6 +189,7 @@ def revoke_auth_session(db: Session, session_token: str) -> bool:
 
 def revoke_all_user_sessions(db: Session, user_id: int) -> int:
     """Revoke all sessions for a user"""
+    session_cache.delete_user(user_id)
     deleted_count = db.query(UserAuthSession).filter(
         UserAuthSession.user_id == user_id
     ).count()
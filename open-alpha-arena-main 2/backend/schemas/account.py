@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field
 from typing import Optional
 
 
@@ -27,7 +27,8 @@ class AccountOut(BaseModel):
     name: str
     model: str
     base_url: str
-    api_key: str  # Will be masked in API responses
+    # ORM objects resolve Account.api_key_masked first; plain dicts and rows may use api_key
+    api_key: str = Field(validation_alias=AliasChoices("api_key_masked", "api_key"))
     initial_capital: float
     current_cash: float
     frozen_cash: float
@@ -0,0 +1,78 @@
+"""
+Account response caching service for the read-heavy account management endpoints
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+import logging
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+class AccountResponseCache:
+    """Simple in-memory cache of account responses, scoped per user, with TTL
+
+    Keys are (user_id, account_id) with account_id None for the account list, so
+    a cached response can never be served to a different user.
+    """
+
+    def __init__(self, ttl_seconds: int = 10):
+        self.cache: Dict[Tuple[int, Optional[int]], Tuple[Any, float]] = {}  # value: (response, timestamp)
+        self.ttl_seconds = ttl_seconds
+        self.lock = Lock()
+
+    def get(self, user_id: int, account_id: Optional[int] = None) -> Optional[Any]:
+        """Get cached response if still valid"""
+        key = (user_id, account_id)
+        current_time = time.time()
+
+        with self.lock:
+            if key in self.cache:
+                response, timestamp = self.cache[key]
+                if current_time - timestamp < self.ttl_seconds:
+                    return response
+                # Remove expired entry
+                del self.cache[key]
+
+        return None
+
+    def set(self, user_id: int, response: Any, account_id: Optional[int] = None):
+        """Cache a response with current timestamp"""
+        with self.lock:
+            self.cache[(user_id, account_id)] = (response, time.time())
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached response for a user after one of their accounts changed"""
+        with self.lock:
+            stale_keys = [key for key in self.cache if key[0] == user_id]
+            for key in stale_keys:
+                del self.cache[key]
+
+        if stale_keys:
+            logger.debug(f"Invalidated {len(stale_keys)} cached account responses for user {user_id}")
+
+    def clear_expired(self):
+        """Remove all expired entries, e.g. for users or accounts that are no longer requested"""
+        current_time = time.time()
+
+        with self.lock:
+            expired_keys = [
+                key for key, (_, timestamp) in self.cache.items()
+                if current_time - timestamp >= self.ttl_seconds
+            ]
+            for key in expired_keys:
+                del self.cache[key]
+
+        if expired_keys:
+            logger.debug(f"Cleared {len(expired_keys)} expired account cache entries")
+
+
+# Global account response cache instance. Balances also change through trading
+# services that bypass these routes, so the TTL is kept short.
+account_cache = AccountResponseCache(ttl_seconds=10)
+
+
+def clear_expired_account_responses():
+    """Clear expired account response entries"""
+    account_cache.clear_expired()
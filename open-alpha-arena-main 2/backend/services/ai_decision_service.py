@@ -322,7 +322,7 @@ def save_ai_decision(db: Session, account: Account, decision: Dict, portfolio: D
 def get_active_ai_accounts(db: Session) -> List[Account]:
     """Get all active AI accounts that are not using default API key"""
     accounts = db.query(Account).filter(
-        Account.is_active == "true",
+        Account.is_active.is_(True),
         Account.account_type == "AI"
     ).all()
     
@@ -0,0 +1,87 @@
+"""
+Session token caching service to avoid a database lookup on every authenticated request
+"""
+
+import datetime
+import hashlib
+import time
+from typing import Dict, Optional, Tuple
+import logging
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+def _token_key(session_token: str) -> str:
+    """Hash the session token so raw tokens are never kept in memory"""
+    return hashlib.sha256(session_token.encode()).hexdigest()
+
+
+class SessionCache:
+    """Simple in-memory session_token -> user_id cache with TTL"""
+
+    def __init__(self, ttl_seconds: int = 120):
+        self.cache: Dict[str, Tuple[int, float]] = {}  # key: sha256(token), value: (user_id, expires_at timestamp)
+        self.ttl_seconds = ttl_seconds
+        self.lock = Lock()
+
+    def get(self, session_token: str) -> Optional[int]:
+        """Get cached user_id if still valid"""
+        key = _token_key(session_token)
+        current_time = time.time()
+
+        with self.lock:
+            if key in self.cache:
+                user_id, expires_at = self.cache[key]
+                if current_time < expires_at:
+                    return user_id
+                # Remove expired entry
+                del self.cache[key]
+
+        return None
+
+    def set(self, session_token: str, user_id: int, session_expires_at: datetime.datetime = None):
+        """Cache a user_id, never beyond the expiry of the session itself"""
+        expires_at = time.time() + self.ttl_seconds
+        if session_expires_at is not None:
+            session_expires_ts = session_expires_at.replace(tzinfo=datetime.timezone.utc).timestamp()
+            expires_at = min(expires_at, session_expires_ts)
+
+        with self.lock:
+            self.cache[_token_key(session_token)] = (user_id, expires_at)
+
+    def delete(self, session_token: str):
+        """Drop a cached session token"""
+        with self.lock:
+            self.cache.pop(_token_key(session_token), None)
+
+    def delete_user(self, user_id: int):
+        """Drop every cached session token belonging to a user"""
+        with self.lock:
+            stale_keys = [key for key, (cached_user_id, _) in self.cache.items() if cached_user_id == user_id]
+            for key in stale_keys:
+                del self.cache[key]
+
+        if stale_keys:
+            logger.debug(f"Dropped {len(stale_keys)} cached sessions for user {user_id}")
+
+    def clear_expired(self):
+        """Remove all expired entries, including tokens that are never looked up again"""
+        current_time = time.time()
+
+        with self.lock:
+            expired_keys = [key for key, (_, expires_at) in self.cache.items() if current_time >= expires_at]
+            for key in expired_keys:
+                del self.cache[key]
+
+        if expired_keys:
+            logger.debug(f"Cleared {len(expired_keys)} expired session cache entries")
+
+
+# Global session cache instance
+session_cache = SessionCache(ttl_seconds=120)  # Cache session lookups for 2 minutes
+
+
+def clear_expired_sessions():
+    """Clear expired session entries"""
+    session_cache.clear_expired()
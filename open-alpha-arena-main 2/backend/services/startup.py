@@ -37,6 +37,24 @@ def initialize_services():
             task_id="price_cache_cleanup"
         )
         logger.info("Price cache cleanup task started (2-minute interval)")
+
+        # Add session cache cleanup task (every 2 minutes)
+        from services.session_cache import clear_expired_sessions
+        task_scheduler.add_interval_task(
+            task_func=clear_expired_sessions,
+            interval_seconds=120,  # Clean every 2 minutes
+            task_id="session_cache_cleanup"
+        )
+        logger.info("Session cache cleanup task started (2-minute interval)")
+
+        # Add account response cache cleanup task (every 2 minutes)
+        from services.account_cache import clear_expired_account_responses
+        task_scheduler.add_interval_task(
+            task_func=clear_expired_account_responses,
+            interval_seconds=120,  # Clean every 2 minutes
+            task_id="account_cache_cleanup"
+        )
+        logger.info("Account cache cleanup task started (2-minute interval)")
         
         logger.info("All services initialized successfully")
         